@@ -3,13 +3,61 @@ CLI module for managing players, teams, match results, and CSV import/export.
 """
 
 import argparse
-import os
+import sys
+from functools import lru_cache
+from operator import itemgetter
+from typing import TYPE_CHECKING, Optional
 
-from .db import DB
+from .player import ATTRIBUTE_NAMES as _ATTRS
 from .player import Attributes, Player
 
-# Initialize the database connection.
-db = DB(db_name=os.getenv("FOOTBALL_DB", "football.db"))
+if TYPE_CHECKING:
+    from .db import DB
+
+# --------------------------
+# Display Constants
+# --------------------------
+# Single-letter shorthands (s/d/p/t/f/g): the `player add` flags and
+# `player update` aliases.
+_ATTR_SHORT = {attr[0]: attr for attr in _ATTRS}
+
+# Columns `player update` may change.
+_UPDATABLE = _ATTRS + ("form",)
+
+
+def _resolve_attr(name: str) -> str:
+    """Expands a single-letter shorthand to the full attribute name."""
+    name = name.lower()
+    return _ATTR_SHORT.get(name, name)
+
+
+# Values `player rank` accepts.
+_RANKABLE = ("overall",) + _ATTRS
+
+# The two sides produced by `teams create`.
+_TEAMS = ("team1", "team2")
+
+# Display label for each attribute, in _ATTRS order.
+_ATTR_LABELS = {attr: attr.capitalize() for attr in _ATTRS}
+
+_HEADERS = ("Name", "Form") + tuple(_ATTR_LABELS.values())
+_ROW_FMT = "%-20s %-10s %-10s %-10s %-10s %-10s %-10s %-10s"
+_HEADER_LINE = _ROW_FMT % _HEADERS
+# Pulls a player row's columns out in table order.
+_ROW_VALUES = itemgetter("name", "form", *_ATTRS)
+_SEP = "-" * 100
+
+
+def _get_db() -> "DB":
+    """
+    Returns the shared database connection, opening it on first use.
+
+    The database module is imported here so that parse-only paths such as
+    `--help` or argument errors never load sqlite3 or open the file.
+    """
+    from .db import get_db
+
+    return get_db()
 
 
 # --------------------------
@@ -17,102 +65,70 @@ db = DB(db_name=os.getenv("FOOTBALL_DB", "football.db"))
 # --------------------------
 
 
-def add_player(args):
+def add_player(args: argparse.Namespace) -> None:
     """Adds a new player to the database."""
-
-    attributes = Attributes.from_values(
-        {
-            "shooting": args.shooting,
-            "dribbling": args.dribbling,
-            "passing": args.passing,
-            "tackling": args.tackling,
-            "fitness": args.fitness,
-            "goalkeeping": args.goalkeeping,
-        }
+    attributes = Attributes.from_tuple(
+        args.shooting,
+        args.dribbling,
+        args.passing,
+        args.tackling,
+        args.fitness,
+        args.goalkeeping,
     )
     player = Player(name=args.name, attributes=attributes, form=5)
-    db.add_player(player)
+    _get_db().add_player(player)
     print(f"✅ Player '{args.name}' added!")
 
 
-def remove_player(args):
+def remove_player(args: argparse.Namespace) -> None:
     """Removes a player from the database."""
-    db.remove_player(args.name)
+    _get_db().remove_player(args.name)
     print(f"🗑️ Player '{args.name}' removed.")
 
 
-def update_player(args):
+def update_player(args: argparse.Namespace) -> None:
     """Updates a player's attribute."""
-    attributes_map = {
-        "s": "shooting",
-        "d": "dribbling",
-        "p": "passing",
-        "t": "tackling",
-        "f": "fitness",
-        "g": "goalkeeping",
-    }
-    attribute = attributes_map.get(args.attribute, args.attribute)
-    db.update_player_attribute(args.name, attribute, args.value)
-    print(f"🔄 Updated {attribute} of '{args.name}' to {args.value}.")
-
-
-def list_players(args):
+    _get_db().update_player_attribute(args.name, args.attribute, args.value)
+    print(f"🔄 Updated {args.attribute} of '{args.name}' to {args.value}.")
+
+
+def list_players(args: argparse.Namespace) -> None:
     """Lists all players in the database."""
-    players = db.get_all_players()
+    players = _get_db().get_all_players()
     if not players:
         print("❌ No players found in the database.")
         return
 
-    headers = [
-        "Name",
-        "Form",
-        "Shooting",
-        "Dribbling",
-        "Passing",
-        "Tackling",
-        "Fitness",
-        "Goalkeeping",
-    ]
-    format_str = "{:<20} {:<10} {:<10} {:<10} {:<10} {:<10} {:<10} {:<10}"
-    print("\n📋 **Players in Database:**")
-    print(format_str.format(*headers))
-    print("-" * 100)
-    for player in players:
-        print(
-            format_str.format(
-                player["name"],
-                player["form"],
-                player["shooting"],
-                player["dribbling"],
-                player["passing"],
-                player["tackling"],
-                player["fitness"],
-                player["goalkeeping"],
-            )
-        )
+    # Render the whole table and emit it with a single write.
+    lines = ["\n📋 **Players in Database:**", _HEADER_LINE, _SEP]
+    lines.extend(_ROW_FMT % _ROW_VALUES(player) for player in players)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def list_player_attributes(args):
+def list_player_attributes(args: argparse.Namespace) -> None:
     """
     Lists all the attribute values for a given player.
     Usage: player attributes <player_name>
     """
-    player = db.get_player_by_name(args.name)
+    player = _get_db().get_player_by_name(args.name)
     if not player:
         print(f"❌ Player '{args.name}' not found.")
         return
 
-    print(f"\n📊 Attributes for {player.name}:")
-    print(f"  Shooting:        {player.attributes.shooting.get_score()}")
-    print(f"  Dribbling:       {player.attributes.dribbling.get_score()}")
-    print(f"  Passing:         {player.attributes.passing.get_score()}")
-    print(f"  Tackling:        {player.attributes.tackling.get_score()}")
-    print(f"  Fitness:         {player.attributes.fitness.get_score()}")
-    print(f"  Goalkeeping:     {player.attributes.goalkeeping.get_score()}")
-    print(f"⭐ Overall Rating: {player.get_overall_rating(round_num=True)}")
+    lines = [f"\n📊 Attributes for {player.name}:"]
+    lines.extend(
+        f"  {label + ':':<17}{score}"
+        for label, score in zip(
+            _ATTR_LABELS.values(), player.attributes.scores()
+        )
+    )
+    lines.append(
+        f"⭐ Overall Rating: {player.get_overall_rating(round_num=True)}"
+    )
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def rank_players(args):
+def rank_players(args: argparse.Namespace) -> None:
     """
     Ranks players based on overall rating or a specific attribute.
 
@@ -122,128 +138,118 @@ def rank_players(args):
       - If no attribute is provided, rankings for overall rating and all
         individual attributes are displayed.
 
-    Valid attribute values are: overall, shooting, dribbling, passing, tackling,
-    fitness, goalkeeping.
+    Valid attribute values are checked by argparse: overall, shooting,
+    dribbling, passing, tackling, fitness, goalkeeping.
     """
+
+    def print_ranking(title, ranking):
+        lines = [f"\n🏅 Ranking by {title}:"]
+        lines.extend(
+            f"{i}. {name} - {title}: {score:.2f}"
+            for i, (name, score) in enumerate(ranking, 1)
+        )
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    def sort_scores(scored):
+        # Scores are computed once up front; the sort only compares floats.
+        scored.sort(key=itemgetter(1), reverse=True)
+        return scored
+
+    db = _get_db()
+    attr = args.attribute
+
+    # A single stored attribute is ranked by SQLite directly, without
+    # building Player objects.
+    if attr in _ATTRS:
+        ranking = db.rank_by_attribute(attr)
+        if not ranking:
+            print("❌ No players found in the database.")
+            return
+        print_ranking(_ATTR_LABELS[attr], ranking)
+        return
+
     # Retrieve full player instances from the database.
-    players = [db.get_player_by_name(p["name"]) for p in db.get_all_players()]
+    players = db.get_all_player_objects()
     if not players:
         print("❌ No players found in the database.")
         return
 
-    def print_ranking(title, key_func):
-        sorted_players = sorted(players, key=key_func, reverse=True)
-        print(f"\n🏅 Ranking by {title}:")
-        for i, player in enumerate(sorted_players, 1):
-            if title.lower() == "overall rating":
-                score = player.get_overall_rating()
-            else:
-                # Dynamically retrieve the attribute score.
-                attr_obj = getattr(player.attributes, title.lower())
-                score = attr_obj.get_score()
-            print(f"{i}. {player.name} - {title}: {score:.2f}")
+    overall = sort_scores(
+        [(player.name, player.get_overall_rating()) for player in players]
+    )
 
     # If no attribute is provided, default to showing all rankings.
-    if not args.attribute:
-        print_ranking("Overall Rating", lambda p: p.get_overall_rating())
-        for attr in [
-            "shooting",
-            "dribbling",
-            "passing",
-            "tackling",
-            "fitness",
-            "goalkeeping",
-        ]:
+    if attr is None:
+        print_ranking("Overall Rating", overall)
+        # One scores() call per player covers every attribute ranking.
+        score_rows = [player.attributes.scores() for player in players]
+        for index, label in enumerate(_ATTR_LABELS.values()):
             print_ranking(
-                attr.capitalize(),
-                lambda p, a=attr: getattr(p.attributes, a).get_score(),
+                label,
+                sort_scores(
+                    [
+                        (player.name, scores[index])
+                        for scores, player in zip(score_rows, players)
+                    ]
+                ),
             )
     else:
-        attr = args.attribute.lower()
-        if attr == "overall":
-            print_ranking("Overall Rating", lambda p: p.get_overall_rating())
-        elif attr in [
-            "shooting",
-            "dribbling",
-            "passing",
-            "tackling",
-            "fitness",
-            "goalkeeping",
-        ]:
-            print_ranking(
-                attr.capitalize(),
-                lambda p: getattr(p.attributes, attr).get_score(),
-            )
-        else:
-            print(
-                f"❌ Invalid attribute '{args.attribute}'. Valid options are "
-                "overall, shooting, dribbling, passing, tackling, fitness, "
-                "goalkeeping."
-            )
+        print_ranking("Overall Rating", overall)
 
 
 # --------------------------
 # Team Command Handlers
 # --------------------------
-def create_teams(args):
+def create_teams(args: argparse.Namespace) -> None:
     """Creates balanced teams from given player names."""
-    team1, team2 = db.create_teams(args.players)
-    if team1 and team2:
-        print("✅ Teams created successfully!")
-        print("\n🏆 **Team 1:**")
-        print(
-            f"  Rating: {team1.get_overall_rating(round_num=True)} Bonus: {team1.bonus}\n"
-        )
-        for player in team1.players:
-            print(
-                f"- {player.name} (Rating: {player.get_overall_rating(round_num=True)})"
-            )
+    teams = _get_db().create_teams(args.players)
+    if not teams:
+        print("❌ Error: Could not create teams. Check player names.")
+        return
 
-        print("\n🔥 **Team 2:**")
-        print(
-            f"  Rating: {team2.get_overall_rating(round_num=True)} Bonus: {team2.bonus}\n"
+    lines = ["✅ Teams created successfully!"]
+    for title, team in zip(("🏆 **Team 1:**", "🔥 **Team 2:**"), teams):
+        # Rate each player once and derive the team total from those values.
+        ratings = [player.get_overall_rating() for player in team.players]
+        team_rating = round(sum(ratings) * team.bonus, 2)
+        lines.append(f"\n{title}")
+        lines.append(f"  Rating: {team_rating} Bonus: {team.bonus}\n")
+        lines.extend(
+            f"- {player.name} (Rating: {round(rating, 2)})"
+            for player, rating in zip(team.players, ratings)
         )
-        for player in team2.players:
-            print(
-                f"- {player.name} (Rating: {player.get_overall_rating(round_num=True)})"
-            )
-    else:
-        print("❌ Error: Could not create teams. Check player names.")
+    print("\n".join(lines))
 
 
-def record_match_result(args):
+def record_match_result(args: argparse.Namespace) -> None:
     """Records the last match result and updates player form."""
-    db.record_match_result(args.winning_team)
+    _get_db().record_match_result(args.winning_team)
     print(f"✅ Match recorded: {args.winning_team} won!")
 
 
-def get_team_attributes(args):
+def get_team_attributes(args: argparse.Namespace) -> None:
     """Displays the attribute ratings of the last generated team."""
-    teams = db.get_last_teams()
+    teams = _get_db().get_last_teams()
     team_key = args.team
-    if not teams[team_key]:
+    players = teams[team_key].players
+    if not players:
         print(f"❌ No previous team '{team_key}' found.")
         return
 
-    print(f"\n📊 **{team_key.capitalize()} Attributes:**")
-    for attr in [
-        "shooting",
-        "dribbling",
-        "passing",
-        "tackling",
-        "fitness",
-        "goalkeeping",
-    ]:
-        avg_rating = sum(
-            getattr(player.attributes, attr).score
-            for player in teams[team_key].players
-        ) / len(teams[team_key].players)
-        print(f"- {attr.capitalize()}: {avg_rating:.2f}")
-
-
-def get_team_rating(args):
+    lines = [f"\n📊 **{team_key.capitalize()} Attributes:**"]
+    # Transpose the squad's score tuples into per-attribute columns so every
+    # player is visited once.
+    columns = zip(*(player.attributes.scores() for player in players))
+    lines.extend(
+        f"- {label}: {sum(column) / len(players):.2f}"
+        for label, column in zip(_ATTR_LABELS.values(), columns)
+    )
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def get_team_rating(args: argparse.Namespace) -> None:
     """Displays the overall team rating of the last generated team."""
-    teams = db.get_last_teams()
+    teams = _get_db().get_last_teams()
     team = teams[args.team]
     if not team:
         print(f"❌ No previous team '{args.team}' found.")
@@ -257,25 +263,38 @@ def get_team_rating(args):
 # --------------------------
 # Database Command Handlers
 # --------------------------
-def clear_database(args):
+def clear_database(args: argparse.Namespace) -> None:
     """Clears all players, matches, and team history from the database."""
-    db.clear_database()
+    _get_db().clear_database()
     print("🗑️ All data has been removed from the database.")
 
 
-def export_csv(args):
+def export_csv(args: argparse.Namespace) -> None:
     """Exports the players table to a CSV file."""
-    db.export_to_csv(args.filename)
+    _get_db().export_to_csv(args.filename)
 
 
-def import_csv(args):
+def import_csv(args: argparse.Namespace) -> None:
     """Imports players from a CSV file into the database."""
-    db.import_from_csv(args.filename)
+    _get_db().import_from_csv(args.filename)
 
 
 # --------------------------
 # Subparser Setup Functions
 # --------------------------
+def _add_skill_args(parser: argparse.ArgumentParser) -> None:
+    """Adds a required -x/--name option for each of the six attributes."""
+    for short, attr in _ATTR_SHORT.items():
+        kind = "level" if attr == "fitness" else "skill"
+        parser.add_argument(
+            f"-{short}",
+            f"--{attr}",
+            type=int,
+            required=True,
+            help=f"{_ATTR_LABELS[attr]} {kind} (1-10)",
+        )
+
+
 def setup_player_subparser(subparsers):
     player_parser = subparsers.add_parser("player", help="Manage players")
     player_subparsers = player_parser.add_subparsers(
@@ -284,40 +303,7 @@ def setup_player_subparser(subparsers):
 
     add_parser = player_subparsers.add_parser("add", help="Add a new player")
     add_parser.add_argument("name", type=str, help="Player's name")
-    add_parser.add_argument(
-        "-s",
-        "--shooting",
-        type=int,
-        required=True,
-        help="Shooting skill (1-10)",
-    )
-    add_parser.add_argument(
-        "-d",
-        "--dribbling",
-        type=int,
-        required=True,
-        help="Dribbling skill (1-10)",
-    )
-    add_parser.add_argument(
-        "-p", "--passing", type=int, required=True, help="Passing skill (1-10)"
-    )
-    add_parser.add_argument(
-        "-t",
-        "--tackling",
-        type=int,
-        required=True,
-        help="Tackling skill (1-10)",
-    )
-    add_parser.add_argument(
-        "-f", "--fitness", type=int, required=True, help="Fitness level (1-10)"
-    )
-    add_parser.add_argument(
-        "-g",
-        "--goalkeeping",
-        type=int,
-        required=True,
-        help="Goalkeeping skill (1-10)",
-    )
+    _add_skill_args(add_parser)
     add_parser.set_defaults(func=add_player)
 
     remove_parser = player_subparsers.add_parser(
@@ -329,14 +315,17 @@ def setup_player_subparser(subparsers):
     reset_parser = player_subparsers.add_parser(
         "reset_forms", help="Reset all player forms to default (5)"
     )
-    reset_parser.set_defaults(func=lambda args: db.reset_player_forms())
+    reset_parser.set_defaults(func=lambda args: _get_db().reset_player_forms())
 
     update_parser = player_subparsers.add_parser(
         "update", help="Update a player's skill"
     )
     update_parser.add_argument("name", type=str, help="Player's name")
     update_parser.add_argument(
-        "attribute", type=str, help="Attribute to update"
+        "attribute",
+        type=_resolve_attr,
+        choices=_UPDATABLE,
+        help="Attribute to update (full name or s/d/p/t/f/g shorthand)",
     )
     update_parser.add_argument("value", type=int, help="New value")
     update_parser.set_defaults(func=update_player)
@@ -356,6 +345,8 @@ def setup_player_subparser(subparsers):
     rank_parser.add_argument(
         "attribute",
         nargs="?",
+        type=str.lower,
+        choices=_RANKABLE,
         help=(
             "Attribute to rank by (overall, shooting, dribbling, passing, "
             "tackling, fitness, goalkeeping). If omitted, all rankings will "
@@ -381,24 +372,20 @@ def setup_team_subparser(subparsers):
         "result", help="Record match result"
     )
     result_parser.add_argument(
-        "winning_team", choices=["team1", "team2"], help="Winning team"
+        "winning_team", choices=_TEAMS, help="Winning team"
     )
     result_parser.set_defaults(func=record_match_result)
 
     attr_parser = team_subparsers.add_parser(
         "attributes", help="Get team attribute ratings"
     )
-    attr_parser.add_argument(
-        "team", choices=["team1", "team2"], help="Select team"
-    )
+    attr_parser.add_argument("team", choices=_TEAMS, help="Select team")
     attr_parser.set_defaults(func=get_team_attributes)
 
     rating_parser = team_subparsers.add_parser(
         "rating", help="Get overall team rating"
     )
-    rating_parser.add_argument(
-        "team", choices=["team1", "team2"], help="Select team"
-    )
+    rating_parser.add_argument("team", choices=_TEAMS, help="Select team")
     rating_parser.set_defaults(func=get_team_rating)
 
 
@@ -441,15 +428,40 @@ def setup_database_subparser(subparsers):
 # --------------------------
 # Main CLI Entry Point
 # --------------------------
-def main():
+_SUBPARSER_SETUP = {
+    "player": setup_player_subparser,
+    "teams": setup_team_subparser,
+    "database": setup_database_subparser,
+}
+
+
+@lru_cache(maxsize=None)
+def _build_parser(command: Optional[str]) -> argparse.ArgumentParser:
+    """
+    Builds the argument parser, caching it for repeated in-process calls.
+
+    Only the subparser for `command` is set up. Top-level help and unknown
+    commands get every subparser so usage stays complete.
+
+    :param command:
+        The first non-option argument on the command line, if any.
+    """
     parser = argparse.ArgumentParser(description="Football Team Manager CLI")
     subparsers = parser.add_subparsers(dest="command", required=True)
 
-    setup_player_subparser(subparsers)
-    setup_team_subparser(subparsers)
-    setup_database_subparser(subparsers)
+    if command in _SUBPARSER_SETUP:
+        _SUBPARSER_SETUP[command](subparsers)
+    else:
+        for setup in _SUBPARSER_SETUP.values():
+            setup(subparsers)
+    return parser
+
 
-    args = parser.parse_args()
+def main() -> None:
+    command = next((arg for arg in sys.argv[1:] if arg[:1] != "-"), None)
+    if command not in _SUBPARSER_SETUP:
+        command = None
+    args = _build_parser(command).parse_args()
     args.func(args)
 
 
@@ -3,35 +3,148 @@ This module provides SQLite database functionality for managing players,
 teams (as dynamic subsets), and match history.
 """
 
+import atexit
 import csv
 import os
 import sqlite3
-from typing import Dict, List, Optional, Tuple
+from contextlib import contextmanager
+from itertools import groupby, islice
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from .player import Attributes, Player
+from .player import ATTRIBUTE_NAMES, Attributes, Player
 from .teams import Team, TeamCreator
 
+# Bump whenever create_tables changes so existing databases are migrated.
+SCHEMA_VERSION = 2
+
+PLAYER_COLUMNS = ATTRIBUTE_NAMES + ("form",)
+
+# Rows handed to a single executemany call during bulk inserts, and fetched
+# per fetchmany call when exporting.
+BATCH_SIZE = 1000
+# Buffer size for the CSV files read and written by import/export.
+CSV_BUFFER_SIZE = 1 << 20
+
+# Connection settings applied in fast mode. Each one is tried separately so
+# that a failure (such as WAL on a read-only directory) does not skip the rest.
+_FAST_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# SQL text is built once so sqlite3's statement cache can reuse the
+# prepared statements across calls.
+_SQL_INSERT_PLAYERS = """
+INSERT INTO players (name, shooting, dribbling, passing, tackling, fitness,
+                     goalkeeping, form)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(name) DO NOTHING
+"""
+_SQL_INSERT_PLAYER = _SQL_INSERT_PLAYERS + "RETURNING id\n"
+# RETURNING needs SQLite 3.35; older libraries fall back to lastrowid.
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_SQL_SELECT_PLAYER = """
+SELECT shooting, dribbling, passing, tackling, fitness, goalkeeping, form
+FROM players WHERE name = ?
+"""
+_SQL_SELECT_ALL_PLAYERS = """
+SELECT name, shooting, dribbling, passing, tackling, fitness, goalkeeping, form
+FROM players
+"""
+_SQL_SELECT_PLAYERS = (
+    _SQL_SELECT_ALL_PLAYERS + "WHERE name IN ({placeholders})\n"
+)
+_SQL_SELECT_LAST_TEAMS = """
+SELECT lt.team, lt.bonus, p.name, p.shooting, p.dribbling, p.passing,
+       p.tackling, p.fitness, p.goalkeeping, p.form
+FROM last_teams lt JOIN players p ON p.name = lt.player_name
+ORDER BY lt.team, lt.id
+"""
+# Same bounds as Player.update_form.
+_SQL_RAISE_FORM = (
+    "UPDATE players SET form = MIN(form + 1, 10) "
+    "WHERE name IN ({placeholders})"
+)
+_SQL_LOWER_FORM = (
+    "UPDATE players SET form = MAX(form - 1, 0) "
+    "WHERE name IN ({placeholders})"
+)
+_SQL_INSERT_MATCH_PLAYERS = """
+INSERT INTO match_players (match_id, player_id, team_number)
+SELECT ?, id, ? FROM players WHERE name IN ({placeholders})
+"""
+# Ties keep insertion order, matching a stable sort of get_all_players().
+_SQL_RANK_PLAYERS = {
+    column: f"SELECT name, {column} FROM players ORDER BY {column} DESC, id"
+    for column in ATTRIBUTE_NAMES
+}
+# Lets rank_by_attribute walk an index instead of sorting the table.
+_SQL_CREATE_RANK_INDEXES = "\n".join(
+    f"CREATE INDEX IF NOT EXISTS idx_players_{column} "
+    f"ON players({column} DESC);"
+    for column in ATTRIBUTE_NAMES
+)
+_SQL_UPDATE_PLAYER = {
+    column: f"UPDATE players SET {column} = ? WHERE name = ?"
+    for column in PLAYER_COLUMNS
+}
+
 
 class DB:
     """
     Manages database interactions for players, teams, and matches.
     """
 
-    def __init__(self, db_name=None):
+    def __init__(self, db_name=None, fast_mode: bool = True):
         """
         Initializes the database connection and creates tables if needed.
+
+        :param db_name:
+            Path to the SQLite file. Defaults to $FOOTBALL_DB or
+            "football.db".
+        :param fast_mode:
+            Use write-ahead logging with relaxed syncing. Set to False to
+            keep SQLite's fully synchronous defaults.
         """
         self.db_name = db_name or os.getenv("FOOTBALL_DB", "football.db")
-        self.conn = sqlite3.connect(self.db_name)
+        # Autocommit mode: transactions are opened explicitly by
+        # `transaction()`, so reads never hold one open.
+        self.conn = sqlite3.connect(
+            self.db_name, cached_statements=256, isolation_level=None
+        )
+        if fast_mode:
+            for pragma in _FAST_PRAGMAS:
+                try:
+                    self.conn.execute(pragma)
+                except sqlite3.OperationalError:
+                    # e.g. WAL cannot be enabled on a read-only location;
+                    # SQLite's defaults still work there.
+                    pass
+        self.conn.row_factory = sqlite3.Row
         self.cursor = self.conn.cursor()
+        self._in_transaction = False
+        self._last_teams: Optional[Dict[str, Team]] = None
         self.create_tables()
 
     def create_tables(self) -> None:
         """
         Creates necessary database tables if they do not already exist.
+
+        The schema version is recorded in `PRAGMA user_version`, so databases
+        that are already up to date skip the DDL entirely.
         """
+        self.cursor.execute("PRAGMA user_version")
+        if self.cursor.fetchone()[0] == SCHEMA_VERSION:
+            return
+
         self.cursor.executescript(
-            """
+            f"""
+        BEGIN;
+
         CREATE TABLE IF NOT EXISTS players (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT UNIQUE NOT NULL,
@@ -66,43 +179,92 @@ class DB:
             team TEXT CHECK(team IN ('team1', 'team2')) NOT NULL,
             bonus REAL
         );
+
+        {_SQL_CREATE_RANK_INDEXES}
+
+        PRAGMA user_version = {SCHEMA_VERSION};
+
+        COMMIT;
         """
         )
-        self.conn.commit()
 
-    def add_player(self, player: Player) -> Optional[int]:
+    @contextmanager
+    def transaction(self) -> Iterator["DB"]:
         """
-        Adds a new player to the database.
+        Groups several operations into a single transaction.
+
+        The outermost block commits once on exit and rolls back if an
+        exception escapes. Nested blocks, including the ones used by every
+        mutating method, join the enclosing transaction. Every block, nested
+        or not, discards the cached result of `get_last_teams`, and so does
+        a rollback.
         """
+        self._last_teams = None
+        if self._in_transaction:
+            yield self
+            return
+
+        # Only mark the transaction as open once BEGIN has succeeded, so a
+        # failed BEGIN cannot leave later writes thinking they are nested.
+        self.cursor.execute("BEGIN")
+        self._in_transaction = True
         try:
-            self.cursor.execute(
-                """
-               INSERT INTO players (name, shooting, dribbling, passing, tackling, fitness, goalkeeping, form)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-               """,
-                (
-                    player.name,
-                    player.attributes.shooting.score,
-                    player.attributes.dribbling.score,
-                    player.attributes.passing.score,
-                    player.attributes.tackling.score,
-                    player.attributes.fitness.score,
-                    player.attributes.goalkeeping.score,
-                    player.form,
-                ),
-            )
+            yield self
+        except BaseException:
+            self.conn.rollback()
+            self._last_teams = None
+            raise
+        else:
             self.conn.commit()
-            return self.cursor.lastrowid
-        except sqlite3.IntegrityError:
+        finally:
+            self._in_transaction = False
+
+    def add_player(self, player: Player) -> Optional[int]:
+        """
+        Adds a new player to the database.
+        """
+        params = player.to_db_tuple()
+        with self.transaction():
+            if _HAS_RETURNING:
+                self.cursor.execute(_SQL_INSERT_PLAYER, params)
+                row = self.cursor.fetchone()
+                player_id = row[0] if row is not None else None
+            else:
+                self.cursor.execute(_SQL_INSERT_PLAYERS, params)
+                player_id = (
+                    self.cursor.lastrowid if self.cursor.rowcount else None
+                )
+        if player_id is None:
             print(f"Error: Player '{player.name}' already exists.")
             return -1
+        return player_id
+
+    def add_players(self, players: Iterable[Player]) -> int:
+        """
+        Adds several players in batched inserts within a single transaction.
+
+        Players whose names already exist are skipped. The players are
+        consumed lazily, so a generator only ever holds one batch in memory.
+
+        :param players:
+            The players to add.
+        :return:
+            The number of players actually inserted.
+        """
+        rows = (player.to_db_tuple() for player in players)
+        inserted = 0
+        with self.transaction():
+            while batch := list(islice(rows, BATCH_SIZE)):
+                self.cursor.executemany(_SQL_INSERT_PLAYERS, batch)
+                inserted += self.cursor.rowcount
+        return inserted
 
     def remove_player(self, name: str) -> None:
         """
         Removes a player from the database.
         """
-        self.cursor.execute("DELETE FROM players WHERE name = ?", (name,))
-        self.conn.commit()
+        with self.transaction():
+            self.cursor.execute("DELETE FROM players WHERE name = ?", (name,))
 
     def update_player_attribute(
         self, name: str, attribute: str, value: int
@@ -110,85 +272,107 @@ class DB:
         """
         Updates a player's attribute.
         """
-        valid_attributes = [
-            "shooting",
-            "dribbling",
-            "passing",
-            "tackling",
-            "fitness",
-            "goalkeeping",
-            "form",
-        ]
-        if attribute not in valid_attributes:
+        query = _SQL_UPDATE_PLAYER.get(attribute)
+        if query is None:
             print(f"Error: Invalid attribute '{attribute}'.")
             return
 
-        self.cursor.execute(
-            f"UPDATE players SET {attribute} = ? WHERE name = ?", (value, name)
-        )
-        self.conn.commit()
+        with self.transaction():
+            self.cursor.execute(query, (value, name))
 
     def get_player_by_name(self, name: str) -> Optional[Player]:
         """
         Retrieves a player from the database by name.
         """
-        self.cursor.execute(
-            """
-        SELECT shooting, dribbling, passing, tackling, fitness, goalkeeping, form
-        FROM players WHERE name = ?
-        """,
-            (name,),
-        )
+        self.cursor.execute(_SQL_SELECT_PLAYER, (name,))
         row = self.cursor.fetchone()
 
         if row is None:
             return None
 
-        attributes = Attributes.from_values(
-            {
-                "shooting": row[0],
-                "dribbling": row[1],
-                "passing": row[2],
-                "tackling": row[3],
-                "fitness": row[4],
-                "goalkeeping": row[5],
-            }
+        return Player(
+            name=name, attributes=Attributes.from_row(row), form=row["form"]
         )
-        return Player(name=name, attributes=attributes, form=row[6])
 
-    def get_all_players(self) -> List[Dict]:
+    def get_players_by_names(self, names: List[str]) -> List[Player]:
         """
-        Retrieves all players from the database.
+        Retrieves several players from the database with a single query.
+
+        :param names:
+            The names of the players to retrieve.
+        :return:
+            The players that exist, in the order their names were given.
         """
+        if not names:
+            return []
+
+        placeholders = ",".join("?" * len(names))
         self.cursor.execute(
-            """
-        SELECT name, shooting, dribbling, passing, tackling, fitness,
-               goalkeeping, form FROM players;
-        """
+            _SQL_SELECT_PLAYERS.format(placeholders=placeholders), names
         )
 
-        rows = self.cursor.fetchall()
+        players_by_name = {
+            row["name"]: self._player_from_row(row)
+            for row in self.cursor.fetchall()
+        }
+
         return [
-            {
-                "name": row[0],
-                "shooting": row[1],
-                "dribbling": row[2],
-                "passing": row[3],
-                "tackling": row[4],
-                "fitness": row[5],
-                "goalkeeping": row[6],
-                "form": row[7],
-            }
-            for row in rows
+            players_by_name[name] for name in names if name in players_by_name
         ]
 
+    def get_all_player_objects(self) -> List[Player]:
+        """
+        Retrieves every player as a `Player` instance with a single query.
+        """
+        self.cursor.execute(_SQL_SELECT_ALL_PLAYERS)
+        return [self._player_from_row(row) for row in self.cursor.fetchall()]
+
+    @staticmethod
+    def _player_from_row(row: sqlite3.Row) -> Player:
+        """
+        Builds a `Player` from a row holding the name and every player column.
+        """
+        return Player(
+            name=row["name"],
+            attributes=Attributes.from_row(row),
+            form=row["form"],
+        )
+
+    def get_all_players(self) -> List[sqlite3.Row]:
+        """
+        Retrieves all players from the database.
+
+        Rows are returned as-is: `sqlite3.Row` already supports lookup by
+        column name (`row["name"]`), so no per-row dict is built. Use
+        `dict(row)` where a real mapping is needed.
+        """
+        self.cursor.execute(_SQL_SELECT_ALL_PLAYERS)
+        return self.cursor.fetchall()
+
+    def rank_by_attribute(self, attribute: str) -> List[Tuple[str, float]]:
+        """
+        Ranks every player by one stored attribute, highest first.
+
+        :param attribute:
+            One of the six attribute columns.
+        :return:
+            (name, score) pairs, or an empty list for an unknown attribute.
+        """
+        query = _SQL_RANK_PLAYERS.get(attribute)
+        if query is None:
+            print(f"Error: Invalid attribute '{attribute}'.")
+            return []
+
+        self.cursor.execute(query)
+        return [tuple(row) for row in self.cursor.fetchall()]
+
     def reset_player_forms(self) -> None:
         """
         Resets all players' forms to the default value (5).
         """
         try:
-            self.cursor.execute("UPDATE players SET form = 5")
-            self.conn.commit()
+            with self.transaction():
+                self.cursor.execute("UPDATE players SET form = 5")
             print("✅ All player forms have been reset to 5.")
         except Exception as e:
             print(f"❌ Failed to reset forms: {e}")
@@ -199,8 +383,10 @@ class DB:
         """
         Creates balanced teams using `TeamCreator` and stores them in the database.
         """
-        players = [self.get_player_by_name(name) for name in player_names]
-        formatted_players = [p for p in players if p]
+        # A name given twice must not put the same player on both teams.
+        formatted_players = self.get_players_by_names(
+            list(dict.fromkeys(player_names))
+        )
 
         if len(formatted_players) < 2:
             print("❌ Not enough players to create teams.")
@@ -213,53 +399,49 @@ class DB:
         )
         team1, team2 = team_creator.create_balanced_teams()
 
-        self.cursor.execute("DELETE FROM last_teams")
+        with self.transaction():
+            self.cursor.execute("DELETE FROM last_teams")
 
-        for player in team1.players:
-            self.cursor.execute(
+            self.cursor.executemany(
                 "INSERT INTO last_teams (player_name, team, bonus) VALUES (?, ?, ?)",
-                (player.name, "team1", team1.bonus),
+                [
+                    (player.name, team_key, team.bonus)
+                    for team_key, team in (("team1", team1), ("team2", team2))
+                    for player in team.players
+                ],
             )
-        for player in team2.players:
-            self.cursor.execute(
-                "INSERT INTO last_teams (player_name, team, bonus) VALUES (?, ?, ?)",
-                (player.name, "team2", team2.bonus),
-            )
-
-        self.conn.commit()
 
+        # The teams just stored are exactly what get_last_teams would rebuild,
+        # so seed its cache instead of reloading them on the next read. Only
+        # do so once committed: an enclosing transaction may still roll back.
+        if not self._in_transaction:
+            self._last_teams = {"team1": team1, "team2": team2}
         return team1, team2
 
     def get_last_teams(self) -> Dict[str, Team]:
         """
         Retrieves the last stored teams from the database.
+
+        The result is cached until the next write, so repeated calls within
+        one session reuse the same `Team` objects.
         """
-        self.cursor.execute("SELECT player_name, team, bonus FROM last_teams")
-        rows = self.cursor.fetchall()
+        if self._last_teams is not None:
+            return self._last_teams
 
-        team1_players = []
-        team2_players = []
-        team1_bonus = 0.0
-        team2_bonus = 0.0
+        # Fetch the stored lineups together with each player's attributes in
+        # a single join.
+        self.cursor.execute(_SQL_SELECT_LAST_TEAMS)
 
-        for player_name, team, bonus in rows:
-            if team == "team1":
-                team1_players.append(self.get_player_by_name(player_name))
-                team1_bonus = bonus
-            else:
-                team2_players.append(self.get_player_by_name(player_name))
-                team2_bonus = bonus
-
-        return {
-            "team1": Team(
-                [p for p in team1_players if p is not None],
-                team1_bonus,
-            ),
-            "team2": Team(
-                [p for p in team2_players if p is not None],
-                team2_bonus,
-            ),
-        }
+        # Rows arrive grouped by team, so each squad is one contiguous run.
+        teams = {"team1": Team([], 0.0), "team2": Team([], 0.0)}
+        for team, group in groupby(self.cursor.fetchall(), itemgetter("team")):
+            squad = list(group)
+            teams[team] = Team(
+                [self._player_from_row(row) for row in squad],
+                squad[-1]["bonus"],
+            )
+        self._last_teams = teams
+        return self._last_teams
 
     def record_match_result(self, winning_team: str) -> None:
         """
@@ -273,28 +455,46 @@ class DB:
         team1_won = winning_team == "team1"
         team1 = teams["team1"]
         team2 = teams["team2"]
-
-        # Update each player's form based on match outcome.
-        for player in team1.players:
-            player.update_form(won=team1_won)
-        for player in team2.players:
-            player.update_form(won=not team1_won)
-
-        # Persist updated form to the database
-        for player in team1.players + team2.players:
+        winners, losers = (team1, team2) if team1_won else (team2, team1)
+
+        # Keep the in-memory players in step with the stored form.
+        for player in winners.players:
+            player.update_form(won=True)
+        for player in losers.players:
+            player.update_form(won=False)
+
+        with self.transaction():
+            # Adjust form inside SQLite: one set-based UPDATE per side.
+            for query, team in (
+                (_SQL_RAISE_FORM, winners),
+                (_SQL_LOWER_FORM, losers),
+            ):
+                names = [player.name for player in team.players]
+                self.cursor.execute(
+                    query.format(placeholders=",".join("?" * len(names))),
+                    names,
+                )
+
+            winner = 1 if team1_won else 2
             self.cursor.execute(
-                "UPDATE players SET form = ? WHERE name = ?",
-                (player.form, player.name),
+                "INSERT INTO matches (team_1_score, team_2_score, winner) VALUES (?, ?, ?)",
+                (0, 0, winner),
             )
-
-        winner = 1 if team1_won else 2
-        self.cursor.execute(
-            "INSERT INTO matches (team_1_score, team_2_score, winner) VALUES (?, ?, ?)",
-            (0, 0, winner),
-        )
-
-        self.cursor.execute("DELETE FROM last_teams")
-        self.conn.commit()
+            match_id = self.cursor.lastrowid
+
+            # Resolve player ids inside SQLite while recording the lineups,
+            # one statement per team; players deleted since the teams were
+            # made are skipped.
+            for team_number, team in ((1, team1), (2, team2)):
+                names = [player.name for player in team.players]
+                self.cursor.execute(
+                    _SQL_INSERT_MATCH_PLAYERS.format(
+                        placeholders=",".join("?" * len(names))
+                    ),
+                    (match_id, team_number, *names),
+                )
+
+            self.cursor.execute("DELETE FROM last_teams")
 
         print(f"✅ Match recorded! Winning team: {winning_team.capitalize()}")
 
@@ -302,16 +502,20 @@ class DB:
         """
         Exports the players table to a CSV file.
         """
-        self.cursor.execute(
+        cursor = self.conn.execute(
             "SELECT id, name, shooting, dribbling, passing, tackling, fitness, goalkeeping, form FROM players"
         )
-        rows = self.cursor.fetchall()
-        headers = [desc[0] for desc in self.cursor.description]
+        headers = [desc[0] for desc in cursor.description]
         try:
-            with open(filename, mode="w", newline="") as f:
+            # Rows are streamed in batches so memory use does not grow with
+            # the size of the table.
+            with open(
+                filename, mode="w", newline="", buffering=CSV_BUFFER_SIZE
+            ) as f:
                 writer = csv.writer(f)
                 writer.writerow(headers)
-                writer.writerows(rows)
+                while rows := cursor.fetchmany(BATCH_SIZE):
+                    writer.writerows(rows)
             print(f"✅ Exported players to '{filename}'.")
         except Exception as e:
             print(f"❌ Failed to export CSV: {e}")
@@ -320,33 +524,41 @@ class DB:
         """
         Imports players from a CSV file into the database.
         """
+        parsed = 0
+
+        def read_players(reader: csv.DictReader) -> Iterator[Player]:
+            nonlocal parsed
+            for row in reader:
+                try:
+                    attributes = {
+                        name: float(row[name]) for name in ATTRIBUTE_NAMES
+                    }
+                    player_attributes = Attributes.from_values(attributes)
+                    player = Player(
+                        name=row["name"],
+                        attributes=player_attributes,
+                        form=int(row["form"]),
+                    )
+                except Exception as e:
+                    print(
+                        f"⚠️ Could not import player {row.get('name', '<unknown>')}: {e}"
+                    )
+                    continue
+                parsed += 1
+                yield player
+
         try:
-            with open(filename, mode="r", newline="") as f:
-                reader = csv.DictReader(f)
-                count = 0
-                for row in reader:
-                    try:
-                        attributes = {
-                            "shooting": float(row["shooting"]),
-                            "dribbling": float(row["dribbling"]),
-                            "passing": float(row["passing"]),
-                            "tackling": float(row["tackling"]),
-                            "fitness": float(row["fitness"]),
-                            "goalkeeping": float(row["goalkeeping"]),
-                        }
-                        player_attributes = Attributes.from_values(attributes)
-                        player = Player(
-                            name=row["name"],
-                            attributes=player_attributes,
-                            form=int(row["form"]),
-                        )
-                        self.add_player(player)
-                        count += 1
-                    except Exception as e:
-                        print(
-                            f"⚠️ Could not import player {row.get('name', '<unknown>')}: {e}"
-                        )
-                print(f"✅ Imported {count} players from '{filename}'.")
+            # Rows are parsed and inserted batch by batch while the file is
+            # read, rather than loading the whole CSV first.
+            with open(
+                filename, mode="r", newline="", buffering=CSV_BUFFER_SIZE
+            ) as f:
+                count = self.add_players(read_players(csv.DictReader(f)))
+            if count < parsed:
+                print(
+                    f"⚠️ Skipped {parsed - count} players that already exist."
+                )
+            print(f"✅ Imported {count} players from '{filename}'.")
         except FileNotFoundError:
             print(f"❌ File '{filename}' not found.")
 
@@ -354,15 +566,45 @@ class DB:
         """
         Deletes all data from the database, resetting it to an empty state.
         """
-        self.cursor.execute("DELETE FROM players")
-        self.cursor.execute("DELETE FROM matches")
-        self.cursor.execute("DELETE FROM match_players")
-        self.cursor.execute("DELETE FROM last_teams")
-        self.conn.commit()
+        with self.transaction():
+            self.cursor.execute("DELETE FROM players")
+            self.cursor.execute("DELETE FROM matches")
+            self.cursor.execute("DELETE FROM match_players")
+            self.cursor.execute("DELETE FROM last_teams")
         print("✅ Database cleared successfully!")
 
     def close(self) -> None:
         """
         Closes the database connection.
         """
+        if _pool.get(self.db_name) is self:
+            del _pool[self.db_name]
         self.conn.close()
+
+
+# Open databases keyed by file name, shared across commands in one process.
+_pool: Dict[str, DB] = {}
+
+
+def get_db(db_name: Optional[str] = None) -> DB:
+    """
+    Returns the shared `DB` for a database file, opening it on first use.
+
+    :param db_name:
+        Path to the SQLite file. Defaults to $FOOTBALL_DB or "football.db".
+    """
+    if db_name is None:
+        db_name = os.environ.get("FOOTBALL_DB", "football.db")
+    db = _pool.get(db_name)
+    if db is None:
+        db = _pool[db_name] = DB(db_name=db_name)
+    return db
+
+
+@atexit.register
+def _close_pool() -> None:
+    """
+    Closes every pooled connection when the interpreter exits.
+    """
+    for db in list(_pool.values()):
+        db.close()
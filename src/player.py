@@ -5,7 +5,8 @@ fitness, and goalkeeping. The overall rating is calculated based on attributes
 and current form.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any, Optional, Tuple
 
 __all__ = [
     "Shooting",
@@ -30,8 +31,11 @@ ATTRIBUTE_WEIGHTS = {
     "goalkeeping": 0.05,
 }
 
+# Canonical attribute order, matching the database columns.
+ATTRIBUTE_NAMES = tuple(ATTRIBUTE_WEIGHTS)
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class PlayerAttribute:
     """
     A base class for player attributes that contains a score and provides access
@@ -55,40 +59,40 @@ class PlayerAttribute:
 class Shooting(PlayerAttribute):
     """Represents a player's shooting ability."""
 
-    pass
+    __slots__ = ()
 
 
 class Dribbling(PlayerAttribute):
     """Represents a player's dribbling ability."""
 
-    pass
+    __slots__ = ()
 
 
 class Passing(PlayerAttribute):
     """Represents a player's passing ability."""
 
-    pass
+    __slots__ = ()
 
 
 class Tackling(PlayerAttribute):
     """Represents a player's tackling ability."""
 
-    pass
+    __slots__ = ()
 
 
 class Fitness(PlayerAttribute):
     """Represents a player's fitness level."""
 
-    pass
+    __slots__ = ()
 
 
 class Goalkeeping(PlayerAttribute):
     """Represents a player's goalkeeping ability."""
 
-    pass
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Attributes:
     """
     Groups all of a player's attributes into a single dataclass.
@@ -103,12 +107,10 @@ class Attributes:
 
     @classmethod
     def from_values(cls, values: dict[str, float]) -> "Attributes":
-        for key, value in values.items():
-            if not isinstance(value, (int, float)):
-                raise ValueError(
-                    f"Invalid value for {key}: {value}. Must be numeric."
-                )
-
+        """
+        Builds attributes from a name-to-score mapping, defaulting missing
+        attributes to 5. Each score is validated by its attribute class.
+        """
         return cls(
             shooting=Shooting(values.get("shooting", 5)),
             dribbling=Dribbling(values.get("dribbling", 5)),
@@ -118,31 +120,102 @@ class Attributes:
             goalkeeping=Goalkeeping(values.get("goalkeeping", 5)),
         )
 
+    @classmethod
+    def from_tuple(
+        cls,
+        shooting: float,
+        dribbling: float,
+        passing: float,
+        tackling: float,
+        fitness: float,
+        goalkeeping: float,
+    ) -> "Attributes":
+        """
+        Builds attributes from scores given positionally in
+        `ATTRIBUTE_NAMES` order, the inverse of `scores()`.
+        """
+        return cls(
+            shooting=Shooting(shooting),
+            dribbling=Dribbling(dribbling),
+            passing=Passing(passing),
+            tackling=Tackling(tackling),
+            fitness=Fitness(fitness),
+            goalkeeping=Goalkeeping(goalkeeping),
+        )
+
+    @classmethod
+    def from_row(cls, row: Any) -> "Attributes":
+        """
+        Builds attributes from a row indexable by column name, such as a
+        `sqlite3.Row`, without going through an intermediate dict.
+        """
+        return cls(
+            shooting=Shooting(row["shooting"]),
+            dribbling=Dribbling(row["dribbling"]),
+            passing=Passing(row["passing"]),
+            tackling=Tackling(row["tackling"]),
+            fitness=Fitness(row["fitness"]),
+            goalkeeping=Goalkeeping(row["goalkeeping"]),
+        )
+
+    def scores(self) -> tuple[float, ...]:
+        """
+        Returns the six attribute scores as a flat tuple in
+        `ATTRIBUTE_NAMES` order.
+        """
+        return (
+            self.shooting.score,
+            self.dribbling.score,
+            self.passing.score,
+            self.tackling.score,
+            self.fitness.score,
+            self.goalkeeping.score,
+        )
+
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Player:
     """
     Represents a player with a name, attributes, and form.
     The overall rating is computed from base attributes and current form.
+
+    Players are identified by name: two instances with the same name compare
+    equal and hash alike, mirroring the database's UNIQUE(name) constraint.
     """
 
     name: str
     attributes: Attributes
     form: int  # Form scale 0-10, where 5 is average
+    # (attributes, form, rating) from the last get_overall_rating call.
+    _rating_cache: Optional[Tuple[Attributes, int, float]] = field(
+        default=None, init=False, repr=False
+    )
 
     def __post_init__(self):
         # Clamp form between 0 and 10
         self.form = max(0, min(self.form, 10))
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Player):
+            return NotImplemented
+        return self.name == other.name
+
+    def __hash__(self) -> int:
+        return hash(self.name)
+
     def _get_base_rating(self) -> float:
         """
         Computes the base rating as a weighted average of all player attributes.
         """
-        weighted_sum = sum(
-            getattr(self.attributes, attr).get_score() * weight
-            for attr, weight in ATTRIBUTE_WEIGHTS.items()
+        attributes = self.attributes
+        return (
+            attributes.shooting.score * ATTRIBUTE_WEIGHTS["shooting"]
+            + attributes.dribbling.score * ATTRIBUTE_WEIGHTS["dribbling"]
+            + attributes.passing.score * ATTRIBUTE_WEIGHTS["passing"]
+            + attributes.tackling.score * ATTRIBUTE_WEIGHTS["tackling"]
+            + attributes.fitness.score * ATTRIBUTE_WEIGHTS["fitness"]
+            + attributes.goalkeeping.score * ATTRIBUTE_WEIGHTS["goalkeeping"]
         )
-        return weighted_sum
 
     def get_overall_rating(self, round_num: bool = False) -> float:
         """
@@ -151,16 +224,27 @@ class Player:
 
         The multiplier is 1 + 0.05 * (form - 5). That is, form 5 is neutral.
 
+        The result is cached and only recomputed once the attributes or form
+        change.
+
         :param round:
             Whether to round to 2 decimals. This should only be True if
             outputting to the end user.
 
         """
-        base_rating = self._get_base_rating()
-        multiplier = 1 + 0.05 * (self.form - 5)
+        cache = self._rating_cache
+        if (
+            cache is None
+            or cache[0] is not self.attributes
+            or cache[1] != self.form
+        ):
+            multiplier = 1 + 0.05 * (self.form - 5)
+            rating = self._get_base_rating() * multiplier
+            self._rating_cache = cache = (self.attributes, self.form, rating)
+
         if not round_num:
-            return base_rating * multiplier
-        return round(base_rating * multiplier, 2)
+            return cache[2]
+        return round(cache[2], 2)
 
     def update_form(self, won: bool) -> None:
         """
@@ -171,3 +255,10 @@ class Player:
             self.form = min(self.form + 1, 10)
         else:
             self.form = max(self.form - 1, 0)
+
+    def to_db_tuple(self) -> tuple[Any, ...]:
+        """
+        Returns the player as one flat row for the `players` table: name,
+        the six attribute scores in `ATTRIBUTE_NAMES` order, then form.
+        """
+        return (self.name, *self.attributes.scores(), self.form)
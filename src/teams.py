@@ -81,8 +81,9 @@ class TeamCreator:
         """
         Distributes players into two teams using a zigzag method.
         """
+        # Player caches its overall rating, so the key is cheap to call.
         sorted_players = sorted(
-            self.players, key=lambda x: x.get_overall_rating(), reverse=True
+            self.players, key=Player.get_overall_rating, reverse=True
         )
         team_1_players: List[Player] = []
         team_2_players: List[Player] = []
@@ -115,39 +116,62 @@ class TeamCreator:
             self.team_1.players[idx1],
         )
 
-    def _team_rating_diff(self) -> float:
+    def _team_rating_diff(
+        self, ratings_1: List[float], ratings_2: List[float]
+    ) -> float:
         """
         Determines the absolute difference between the two teams' ratings.
+
+        :param ratings_1:
+            Overall ratings of Team 1's players, in squad order.
+        :param ratings_2:
+            Overall ratings of Team 2's players, in squad order.
         """
         return abs(
-            self.team_1.get_overall_rating() - self.team_2.get_overall_rating()
+            sum(ratings_1) * self.team_1.bonus
+            - sum(ratings_2) * self.team_2.bonus
         )
 
     def _adjust_teams_for_fairness(self) -> None:
         """
         Adjusts teams iteratively by trying all swaps and applying the best one.
+
+        Candidate swaps are evaluated against a list of player ratings rather
+        than re-rating both teams.
         """
+        ratings_1 = [p.get_overall_rating() for p in self.team_1.players]
+        ratings_2 = [p.get_overall_rating() for p in self.team_2.players]
+
         while True:
             best_swap = None
-            best_diff_seen = self._team_rating_diff()
+            best_diff_seen = self._team_rating_diff(ratings_1, ratings_2)
 
             # Try all swaps and find the best one
-            for idx1 in range(len(self.team_1.players)):
-                for idx2 in range(len(self.team_2.players)):
-                    self._swap_players(idx1, idx2)
-                    new_diff = self._team_rating_diff()
+            for idx1 in range(len(ratings_1)):
+                for idx2 in range(len(ratings_2)):
+                    ratings_1[idx1], ratings_2[idx2] = (
+                        ratings_2[idx2],
+                        ratings_1[idx1],
+                    )
+                    new_diff = self._team_rating_diff(ratings_1, ratings_2)
 
                     if new_diff < best_diff_seen:
                         best_diff_seen = new_diff
                         best_swap = (idx1, idx2)
 
-                    self._swap_players(idx1, idx2)  # Undo swap
+                    # Undo swap
+                    ratings_1[idx1], ratings_2[idx2] = (
+                        ratings_2[idx2],
+                        ratings_1[idx1],
+                    )
 
             if best_swap is None:
                 break  # No improving swaps left
 
             # Apply the best swap found
-            self._swap_players(*best_swap)
+            idx1, idx2 = best_swap
+            self._swap_players(idx1, idx2)
+            ratings_1[idx1], ratings_2[idx2] = ratings_2[idx2], ratings_1[idx1]
 
     def create_balanced_teams(self) -> Tuple[Team, Team]:
         """
@@ -138,6 +138,29 @@ def test_update_player(reset_database):
     assert "🔄 Updated shooting of 'TestPlayer' to 95." in result.stdout
 
 
+def test_top_level_help_lists_all_commands():
+    """
+    Tests that top-level help still lists every command even though only the
+    invoked command's parser is built for normal runs.
+    """
+    result = run_cli_command(["-h"])
+    assert "{player,teams,database}" in result.stdout
+
+
+def test_update_player_shorthand(reset_database):
+    """
+    Tests that 'player update' expands shorthands and rejects unknown
+    attributes before touching the database.
+    """
+    add_player_cli("TestPlayer", 8, 7, 9, 6, 9, 5)
+    result = run_cli_command(["player", "update", "TestPlayer", "p", "4"])
+    assert "🔄 Updated passing of 'TestPlayer' to 4." in result.stdout
+
+    with pytest.raises(subprocess.CalledProcessError) as exc_info:
+        run_cli_command(["player", "update", "TestPlayer", "speed", "4"])
+    assert "invalid choice" in exc_info.value.stderr
+
+
 def test_rank_players_all(reset_database):
     """
     Tests that 'player rank' with no argument displays rankings for overall and
@@ -173,11 +196,12 @@ def test_rank_specific(reset_database):
 
 def test_rank_invalid_attribute(reset_database):
     """
-    Tests that 'player rank invalid_attr' outputs an error message.
+    Tests that 'player rank invalid_attr' is rejected by argument parsing.
     """
     add_player_cli("Player1", 8, 7, 8, 6, 8, 5)
-    result = run_cli_command(["player", "rank", "invalid_attr"])
-    assert "Invalid attribute" in result.stdout
+    with pytest.raises(subprocess.CalledProcessError) as exc_info:
+        run_cli_command(["player", "rank", "invalid_attr"])
+    assert "invalid choice: 'invalid_attr'" in exc_info.value.stderr
 
 
 def test_create_teams(reset_database):
@@ -1,8 +1,9 @@
 import os
+import sqlite3
 
 import pytest
 
-from src.db import DB
+from src.db import DB, SCHEMA_VERSION, get_db
 from src.player import ATTRIBUTE_WEIGHTS, Attributes, Player
 
 TEST_DB_PATH = "test_football.db"
@@ -78,6 +79,38 @@ def sample_players():
     ]
 
 
+def test_schema_version_recorded(db):
+    """
+    Tests that the schema version is stored and that reopening an up-to-date
+    database keeps its tables.
+    """
+    db.cursor.execute("PRAGMA user_version")
+    assert db.cursor.fetchone()[0] == SCHEMA_VERSION
+
+    reopened = DB(db_name=TEST_DB_PATH)
+    reopened.cursor.execute("SELECT COUNT(*) FROM players")
+    assert reopened.cursor.fetchone()[0] == 0
+    reopened.close()
+
+
+def test_outdated_schema_is_upgraded(db):
+    """
+    Tests that a database with an older schema version gains the ranking
+    indexes when it is reopened.
+    """
+    db.conn.executescript(
+        "DROP INDEX idx_players_shooting; PRAGMA user_version = 1;"
+    )
+
+    reopened = DB(db_name=TEST_DB_PATH)
+    reopened.cursor.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE name = ?",
+        ("idx_players_shooting",),
+    )
+    assert reopened.cursor.fetchone()[0] == 1
+    reopened.close()
+
+
 def test_add_player(db, sample_players):
     """
     Tests adding a player to the database.
@@ -96,6 +129,102 @@ def test_add_player(db, sample_players):
     assert player_data[1] == sample_players[0].attributes.shooting.score
 
 
+def test_add_duplicate_player(db, sample_players):
+    """
+    Tests that adding a player whose name already exists returns -1 and
+    leaves the original row untouched.
+    """
+    db.add_player(sample_players[0])
+    duplicate = Player(
+        name=sample_players[0].name,
+        attributes=sample_players[1].attributes,
+        form=5,
+    )
+
+    assert db.add_player(duplicate) == -1
+
+    db.cursor.execute("SELECT COUNT(*), shooting FROM players")
+    count, shooting = db.cursor.fetchone()
+    assert count == 1
+    assert shooting == sample_players[0].attributes.shooting.score
+
+
+def test_add_player_without_returning(db, sample_players, monkeypatch):
+    """
+    Tests the lastrowid fallback used when SQLite lacks RETURNING support.
+    """
+    monkeypatch.setattr("src.db._HAS_RETURNING", False)
+
+    player_id = db.add_player(sample_players[0])
+
+    assert (
+        player_id == db.cursor.execute("SELECT id FROM players").fetchone()[0]
+    )
+    assert db.add_player(sample_players[0]) == -1
+
+
+def test_transaction_rolls_back_on_error(db, sample_players):
+    """
+    Tests that operations grouped in a transaction are undone together when
+    the block raises.
+    """
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.add_player(sample_players[0])
+            db.add_player(sample_players[1])
+            raise RuntimeError("abort")
+
+    assert db.get_all_players() == []
+
+
+def test_failed_begin_does_not_leave_transaction_flag(db, sample_players):
+    """
+    Tests that a BEGIN that fails leaves later writes committing normally.
+    """
+    db.conn.execute("BEGIN")
+    with pytest.raises(sqlite3.OperationalError):
+        with db.transaction():
+            pass
+    db.conn.rollback()
+
+    db.add_player(sample_players[0])
+    assert not db.conn.in_transaction
+    assert len(db.get_all_players()) == 1
+
+
+def test_no_transaction_left_open(db, sample_players):
+    """
+    Tests that reads and completed writes leave no transaction open.
+    """
+    db.add_player(sample_players[0])
+    assert not db.conn.in_transaction
+
+    db.get_all_player_objects()
+    assert not db.conn.in_transaction
+
+
+def test_add_players(db, sample_players):
+    """
+    Tests bulk-adding players, skipping names that already exist.
+    """
+    db.add_player(sample_players[0])
+
+    inserted = db.add_players(sample_players)
+
+    assert inserted == len(sample_players) - 1
+    assert len(db.get_all_players()) == len(sample_players)
+
+
+def test_add_players_in_batches(db, sample_players, monkeypatch):
+    """
+    Tests that bulk inserts split into several batches count every row.
+    """
+    monkeypatch.setattr("src.db.BATCH_SIZE", 3)
+
+    assert db.add_players(sample_players) == len(sample_players)
+    assert len(db.get_all_players()) == len(sample_players)
+
+
 def test_remove_player(db, sample_players):
     """
     Tests removing a player from the database.
@@ -139,6 +268,82 @@ def test_create_teams(db, sample_players):
     assert len(team2.players) == 2
 
 
+def test_create_teams_ignores_duplicate_names(db, sample_players):
+    """
+    Tests that a name given twice yields one player, and that recording the
+    resulting match succeeds.
+    """
+    for player in sample_players:
+        db.add_player(player)
+
+    team1, team2 = db.create_teams(
+        ["Player 1", "Player 1", "Player 2", "Player 3"]
+    )
+    names = [p.name for p in team1.players + team2.players]
+    assert sorted(names) == ["Player 1", "Player 2", "Player 3"]
+
+    db.record_match_result("team1")
+    db.cursor.execute("SELECT COUNT(*) FROM match_players")
+    assert db.cursor.fetchone()[0] == 3
+
+
+def test_get_last_teams_cached_until_write(db, sample_players):
+    """
+    Tests that get_last_teams is cached between reads and refreshed after a
+    write.
+    """
+    for player in sample_players:
+        db.add_player(player)
+
+    team1, team2 = db.create_teams(
+        ["Player 1", "Player 2", "Player 3", "Player 4"]
+    )
+    teams = db.get_last_teams()
+    assert teams["team1"] is team1 and teams["team2"] is team2
+    assert db.get_last_teams() is teams
+
+    db.update_player_attribute("Player 1", "form", 9)
+    refreshed = db.get_last_teams()
+    assert refreshed is not teams
+    forms = {p.name: p.form for t in refreshed.values() for p in t.players}
+    assert forms["Player 1"] == 9
+
+
+def test_nested_writes_invalidate_last_teams(db, sample_players):
+    """
+    Tests that writes grouped in one transaction still refresh the cached
+    last teams, so a recorded match cannot be recorded again.
+    """
+    for player in sample_players:
+        db.add_player(player)
+
+    with db.transaction():
+        db.create_teams(["Player 1", "Player 2", "Player 3", "Player 4"])
+        db.record_match_result("team1")
+
+    assert db.get_last_teams()["team1"].players == []
+    db.record_match_result("team1")
+    db.cursor.execute("SELECT COUNT(*) FROM matches")
+    assert db.cursor.fetchone()[0] == 1
+
+
+def test_rolled_back_teams_are_not_cached(db, sample_players):
+    """
+    Tests that teams created in a transaction that rolls back are not
+    returned by get_last_teams.
+    """
+    for player in sample_players:
+        db.add_player(player)
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.create_teams(["Player 1", "Player 2", "Player 3", "Player 4"])
+            raise RuntimeError("abort")
+
+    teams = db.get_last_teams()
+    assert teams["team1"].players == [] and teams["team2"].players == []
+
+
 def test_record_match_result(db, sample_players):
     """
     Tests recording a match result and updating player form.
@@ -181,6 +386,51 @@ def test_record_match_result(db, sample_players):
         ), f"Expected form 4 for {player.name} but got {new_form}"
 
 
+def test_record_match_result_clamps_form(db, sample_players):
+    """
+    Tests that form stays within 0-10 when a match is recorded.
+    """
+    for player in sample_players:
+        db.add_player(player)
+    db.update_player_attribute("Player 1", "form", 10)
+
+    team1, _ = db.create_teams(
+        ["Player 1", "Player 2", "Player 3", "Player 4"]
+    )
+    winner = (
+        "team1" if "Player 1" in {p.name for p in team1.players} else "team2"
+    )
+    db.record_match_result(winner)
+
+    assert db.get_player_by_name("Player 1").form == 10
+
+
+def test_record_match_result_stores_lineups(db, sample_players):
+    """
+    Tests that recording a match stores each player's team in match_players.
+    """
+    for player in sample_players:
+        db.add_player(player)
+
+    db.create_teams(["Player 1", "Player 2", "Player 3", "Player 4"])
+    teams = db.get_last_teams()
+    db.record_match_result("team2")
+
+    db.cursor.execute(
+        """
+        SELECT p.name, mp.team_number FROM match_players mp
+        JOIN players p ON p.id = mp.player_id
+        """
+    )
+    lineups = dict(db.cursor.fetchall())
+
+    assert len(lineups) == len(sample_players)
+    for player in teams["team1"].players:
+        assert lineups[player.name] == 1
+    for player in teams["team2"].players:
+        assert lineups[player.name] == 2
+
+
 def test_get_player_by_name(db, sample_players):
     """
     Tests retrieving a player from the database by name.
@@ -192,6 +442,21 @@ def test_get_player_by_name(db, sample_players):
     assert player.name == sample_players[0].name
 
 
+def test_get_players_by_names(db, sample_players):
+    """
+    Tests retrieving several players at once, skipping unknown names and
+    keeping the requested order.
+    """
+    for player in sample_players:
+        db.add_player(player)
+
+    players = db.get_players_by_names(["Player 3", "Unknown", "Player 1"])
+
+    assert [p.name for p in players] == ["Player 3", "Player 1"]
+    assert players[0].attributes == sample_players[2].attributes
+    assert db.get_players_by_names([]) == []
+
+
 def test_get_all_players(db, sample_players):
     """
     Tests retrieving all players from the database.
@@ -207,6 +472,81 @@ def test_get_all_players(db, sample_players):
     assert player_names == expected_names
 
 
+def test_get_all_player_objects(db, sample_players):
+    """
+    Tests retrieving all players as Player instances.
+    """
+    for player in sample_players:
+        db.add_player(player)
+
+    players = db.get_all_player_objects()
+
+    assert players == sample_players
+    assert [p.attributes for p in players] == [
+        p.attributes for p in sample_players
+    ]
+
+
+def test_rank_by_attribute(db, sample_players):
+    """
+    Tests ranking players by a stored attribute, keeping insertion order for
+    ties, and rejecting unknown columns.
+    """
+    for player in sample_players:
+        db.add_player(player)
+
+    assert db.rank_by_attribute("shooting") == [
+        ("Player 1", 8),
+        ("Player 4", 8),
+        ("Player 2", 7),
+        ("Player 3", 6),
+    ]
+    assert db.rank_by_attribute("name; DROP TABLE players") == []
+
+
+def test_export_to_csv_streams_in_batches(
+    db, sample_players, monkeypatch, tmp_path
+):
+    """
+    Tests that exports spanning several fetch batches write every player.
+    """
+    monkeypatch.setattr("src.db.BATCH_SIZE", 3)
+    db.add_players(sample_players)
+    export_file = tmp_path / "players.csv"
+
+    db.export_to_csv(str(export_file))
+
+    lines = export_file.read_text().splitlines()
+    assert lines[0].startswith("id,name,shooting")
+    assert [line.split(",")[1] for line in lines[1:]] == [
+        p.name for p in sample_players
+    ]
+
+
+def test_import_from_csv_reports_skipped_rows(
+    db, sample_players, tmp_path, capsys
+):
+    """
+    Tests that CSV imports skip malformed rows and names that already exist.
+    """
+    db.add_player(sample_players[0])
+    import_file = tmp_path / "players.csv"
+    import_file.write_text(
+        "name,shooting,dribbling,passing,tackling,fitness,goalkeeping,form\n"
+        "Player 1,1,1,1,1,1,1,5\n"
+        "Broken,x,1,1,1,1,1,5\n"
+        "New Player,6,6,6,6,6,6,5\n"
+    )
+
+    db.import_from_csv(str(import_file))
+
+    output = capsys.readouterr().out
+    assert "Could not import player Broken" in output
+    assert "Skipped 1 players that already exist." in output
+    assert "Imported 1 players" in output
+    assert db.get_player_by_name("New Player") is not None
+
+
 def test_get_nonexistent_player(db):
     """
     Tests retrieving a non-existent player.
@@ -248,3 +588,20 @@ def test_overall_rating_calculation(sample_players):
 
     overall_rating = player.get_overall_rating()
     assert overall_rating == pytest.approx(expected_overall, rel=1e-2)
+
+
+def test_get_db_reuses_connection():
+    """
+    Tests that get_db returns one shared instance per file until it is
+    closed.
+    """
+    first = get_db(TEST_DB_PATH)
+    assert get_db(TEST_DB_PATH) is first
+
+    first.close()
+    second = get_db(TEST_DB_PATH)
+    assert second is not first
+
+    second.close()
+    if os.path.exists(TEST_DB_PATH):
+        os.remove(TEST_DB_PATH)
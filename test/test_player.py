@@ -1,6 +1,6 @@
 import pytest
 
-from src.player import Attributes, Player
+from src.player import ATTRIBUTE_NAMES, ATTRIBUTE_WEIGHTS, Attributes, Player
 
 
 @pytest.fixture
@@ -34,6 +34,49 @@ def test_default_player_attributes(default_player):
     assert player.attributes.goalkeeping.score == 5
 
 
+def test_attribute_scores_order():
+    """
+    Ensures that scores() returns the attribute values in ATTRIBUTE_NAMES
+    order.
+    """
+    values = {name: i + 1 for i, name in enumerate(ATTRIBUTE_NAMES)}
+    attributes = Attributes.from_values(values)
+    assert attributes.scores() == (1, 2, 3, 4, 5, 6)
+
+
+def test_attributes_from_row():
+    """
+    Ensures that attributes can be built from a row keyed by column name.
+    """
+    row = {name: i + 1 for i, name in enumerate(ATTRIBUTE_NAMES)}
+    row["form"] = 7
+    assert Attributes.from_row(row) == Attributes.from_values(
+        {name: row[name] for name in ATTRIBUTE_NAMES}
+    )
+
+
+def test_attributes_from_tuple_round_trips_scores():
+    """
+    Ensures that from_tuple takes scores in the same order scores() returns
+    them.
+    """
+    attributes = Attributes.from_tuple(1, 2, 3, 4, 5, 6)
+    assert attributes.scores() == (1, 2, 3, 4, 5, 6)
+    assert Attributes.from_tuple(*attributes.scores()) == attributes
+
+
+def test_player_to_db_tuple():
+    """
+    Ensures that to_db_tuple flattens a player in players-table column order.
+    """
+    player = Player(
+        name="Flat",
+        attributes=Attributes.from_tuple(1, 2, 3, 4, 5, 6),
+        form=7,
+    )
+    assert player.to_db_tuple() == ("Flat", 1, 2, 3, 4, 5, 6, 7)
+
+
 def test_player_base_rating(default_player):
     """
     Tests that the base rating is calculated correctly.
@@ -84,6 +127,17 @@ def test_update_on_loss(default_player):
     assert player.get_overall_rating() < old_overall
 
 
+def test_overall_rating_tracks_attribute_changes(default_player):
+    """
+    Ensures that a cached overall rating is refreshed when the player's
+    attributes are replaced.
+    """
+    player = default_player
+    old_overall = player.get_overall_rating()
+    player.attributes = Attributes.from_values({"shooting": 10})
+    assert player.get_overall_rating() > old_overall
+
+
 def test_form_clamping():
     """
     Ensures that form values are clamped between 0 and 10.
@@ -142,7 +196,7 @@ def test_attributes_remain_fixed_after_rating():
 
     original_attributes = {
         attr: getattr(player.attributes, attr).get_score()
-        for attr in vars(player.attributes)
+        for attr in ATTRIBUTE_WEIGHTS
     }
     _ = player.get_overall_rating()
 
@@ -231,3 +285,22 @@ def test_invalid_input():
 
     with pytest.raises(ValueError):
         Attributes.from_values(invalid_player_data)
+
+
+def test_players_compare_by_name(default_player):
+    """
+    Ensures that players are equal and hash alike when their names match,
+    regardless of attributes or form.
+    """
+    same_name = Player(
+        name=default_player.name,
+        attributes=Attributes.from_values({"shooting": 9}),
+        form=2,
+    )
+    other_name = Player(
+        name="Jane Doe", attributes=default_player.attributes, form=5
+    )
+
+    assert same_name == default_player
+    assert other_name != default_player
+    assert len({default_player, same_name, other_name}) == 2